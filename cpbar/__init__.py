@@ -11,17 +11,18 @@ __version__ = "1.5.0"
 __author__ = "Carlos Andrade"
 __email__ = "carlos@perezandrade.com"
 
-from .core import main
-from .operations import do_copy, do_remove
-from .benchmark import run_benchmark
 from .ui import ProgressBar, Colors, Cursor
 from .utils import (
     format_size,
     format_time,
     format_speed,
+    parse_size,
     load_config,
     save_config,
+    invalidate_config,
     get_optimal_workers,
+    get_optimal_block_size,
+    get_parallel_threshold,
 )
 
 __all__ = [
@@ -35,7 +36,34 @@ __all__ = [
     'format_size',
     'format_time',
     'format_speed',
+    'parse_size',
     'load_config',
     'save_config',
+    'invalidate_config',
     'get_optimal_workers',
+    'get_optimal_block_size',
+    'get_parallel_threshold',
 ]
+
+# The CLI and the copy/remove/benchmark machinery load on first use, so a
+# command only imports what it runs
+_LAZY_ATTRS = {
+    'main': '.core',
+    'do_copy': '.operations',
+    'do_remove': '.operations',
+    'run_benchmark': '.benchmark',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,27 +6,146 @@ Author: Carlos Andrade <carlos@perezandrade.com>
 """
 
 import os
+import queue
 import shutil
+import statistics
 import time
-import threading
 import tempfile
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from .ui import Colors
-from .utils import load_config, save_config, CONFIG_FILE, BLOCK_SIZE
+from .operations import _copy_fd, _fadvise, _preallocate, _device_queue_depth
+from .utils import (
+    load_config, save_config, format_size, CONFIG_FILE, BLOCK_SIZE, PARALLEL_THRESHOLD,
+    BENCHMARK_BLOCK_SIZES, BENCHMARK_TRIALS, BENCHMARK_MAX_WORKERS, BENCHMARK_THRESHOLD_SIZES, PARALLEL_MIN_GAIN
+)
 
 
-def _benchmark_copy_block(src: str, dst: str, offset: int, size: int, lock: threading.Lock):
-    """Copy a block for benchmarking (without progress tracking)."""
-    with open(src, 'rb') as fsrc:
-        fsrc.seek(offset)
-        data = fsrc.read(size)
+def _copy_range(src_fd: int, dst_fd: int, offset: int, size: int):
+    """Copy a block for benchmarking (without progress tracking).
+
+    Goes through the same kernel-side chain as copy_file_parallel's blocks
+    (copy_file_range, then splice, then pread/pwrite), on descriptors shared
+    by all workers, so the benchmark times the code path it tunes.
+    """
+    copied = _copy_fd(src_fd, dst_fd, offset, size, chunk_size=size, allow_sendfile=False)
+    if copied < size:
+        raise OSError(f"short copy at offset {offset}: {copied} of {size} bytes")
 
-        with lock:
-            with open(dst, 'r+b') as fdst:
-                fdst.seek(offset)
-                fdst.write(data)
+
+def _parallel_copy(executor: ThreadPoolExecutor, workers: int, src: Path, dst: Path, file_size: int,
+                   blocks: list):
+    """Block-copy src to dst on `workers` of executor's threads (without progress tracking).
+
+    Each worker pulls blocks off a shared queue, like copy_file_parallel's
+    workers, through one pair of descriptors shared by all of them.
+    """
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        _fadvise(src_fd, 0, file_size, 'POSIX_FADV_SEQUENTIAL')
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            # Real extents up front, as copy_file_parallel does, so the workers
+            # don't serialize on block allocation in a sparse file
+            _preallocate(dst_fd, file_size)
+            work = queue.SimpleQueue()
+            for block in blocks:
+                work.put(block)
+
+            def worker():
+                while True:
+                    try:
+                        offset, size = work.get_nowait()
+                    except queue.Empty:
+                        return
+                    _copy_range(src_fd, dst_fd, offset, size)
+
+            futures = [executor.submit(worker) for _ in range(min(workers, len(blocks)))]
+            for future in as_completed(futures):
+                future.result()
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    shutil.copystat(src, dst)
+
+
+def _worker_counts(path: Path) -> list:
+    """Worker counts worth benchmarking on this machine, for files under path.
+
+    Spans 1 to twice the CPUs this process may run on, capped at
+    BENCHMARK_MAX_WORKERS and at the request queue of path's block device,
+    so small machines test less and big ones can find a higher optimum.
+    The default of 4 is always tried: copies wait on I/O, not CPU, so it
+    can win even on a single core.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        ncpu = len(os.sched_getaffinity(0))
+    else:
+        ncpu = os.cpu_count() or 1
+    ceiling = BENCHMARK_MAX_WORKERS
+    try:
+        queue_depth = _device_queue_depth(os.stat(path).st_dev)
+    except OSError:
+        queue_depth = None
+    if queue_depth:
+        ceiling = max(2, min(ceiling, queue_depth))
+    counts = {1, 2, 4, ncpu // 2, ncpu, ncpu * 2}
+    return sorted(count for count in counts if 1 <= count <= ceiling)
+
+
+def _serial_copy(src: Path, dst: Path, size: int):
+    """Copy the first size bytes of src to dst in one thread, as copy_file_with_progress does."""
+    src_fd = os.open(src, os.O_RDONLY)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            _copy_fd(src_fd, dst_fd, 0, size)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+    shutil.copystat(src, dst)
+
+
+def _block_layout(file_size: int, block_size: int) -> list:
+    """Split file_size bytes into (offset, size) blocks of block_size."""
+    return [(offset, min(block_size, file_size - offset)) for offset in range(0, file_size, block_size)]
+
+
+def _time_trials(copy, src: Path, dst: Path) -> list:
+    """Run copy() BENCHMARK_TRIALS times and return each run's elapsed seconds.
+
+    Each run starts with both files out of the page cache. dst is kept
+    between runs: every copy truncates it on open, which spares a
+    create and an unlink per trial on filesystems slow at metadata.
+    """
+    times = []
+    for _ in range(BENCHMARK_TRIALS):
+        start = time.perf_counter_ns()
+        copy()
+        times.append((time.perf_counter_ns() - start) / 1e9)
+
+        # Outside the timing: give every trial the same cold cache
+        _drop_cache(dst)
+        _drop_cache(src)
+    return times
+
+
+def _drop_cache(path: Path):
+    """Flush path and evict it from the page cache, so the next trial starts cold."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)  # Dirty pages can't be dropped
+        _fadvise(fd, 0, 0, 'POSIX_FADV_DONTNEED')
+    finally:
+        os.close(fd)
 
 
 def run_benchmark(quiet: bool = False):
@@ -51,95 +170,135 @@ def run_benchmark(quiet: bool = False):
         if not quiet:
             print(f"{Colors.CYAN}Creating 100MB test file...{Colors.RESET}")
 
-        # Create test file with random data
+        # Create test file with random data: one 16MB chunk from the OS
+        # generator, written over and over rotated by an odd number of bytes.
+        # No filesystem block repeats, so deduplicating or compressing
+        # filesystems still store all of it, without paying getrandom(2) for
+        # the whole 100MB
+        chunk_size = 16 * 1024 * 1024
+        doubled = memoryview(os.urandom(chunk_size) * 2)
         with open(test_file, 'wb') as f:
-            # Write in 16MB chunks
-            chunk_size = 16 * 1024 * 1024
-            remaining = test_size
-            while remaining > 0:
-                size = min(chunk_size, remaining)
-                f.write(os.urandom(size))
-                remaining -= size
-
-        # Test different worker counts
-        worker_counts = [1, 2, 4, 6, 8]
+            written = 0
+            shift = 0
+            while written < test_size:
+                size = min(chunk_size, test_size - written)
+                f.write(doubled[shift:shift + size])
+                written += size
+                shift += 4099
+        doubled.release()
+
+        # Writing it left the whole file in the page cache, which would hand the
+        # first trials a free warm read
+        _drop_cache(test_file)
+
+        # Test different worker counts and block sizes, all through the same
+        # block-copy path so only the concurrency and block size differ. A full
+        # grid would be dozens of 100MB copies, so it's swept in two passes:
+        # every worker count at the default block size, then every block size
+        # at the best worker count. The best block size varies by filesystem
+        # far more than the best worker count does
+        worker_counts = _worker_counts(tmpdir_path)
         results = {}
+        medians = {}
 
-        if not quiet:
-            print(f"\n{Colors.BOLD}Testing different worker counts:{Colors.RESET}")
-
-        for workers in worker_counts:
-            dest_file = tmpdir_path / f"test_copy_{workers}.bin"
-
-            # Run 3 trials and take the average
-            times = []
-            for _ in range(3):
-                if dest_file.exists():
-                    dest_file.unlink()
-
-                start = time.time()
-
-                # Suppress output during benchmark
-                if workers == 1:
-                    # Use normal copy for baseline
-                    shutil.copy2(test_file, dest_file)
-                else:
-                    # Use parallel copy (we need to bypass the progress bar for accurate timing)
-                    src_stat = test_file.stat()
-                    with open(dest_file, 'wb') as fdst:
-                        fdst.seek(src_stat.st_size - 1)
-                        fdst.write(b'\0')
-
-                    block_size = BLOCK_SIZE  # 32MB blocks
-                    blocks = []
-                    offset = 0
-                    block_num = 0
-                    file_size = src_stat.st_size
-
-                    while offset < file_size:
-                        current_block_size = min(block_size, file_size - offset)
-                        blocks.append((offset, current_block_size, block_num))
-                        offset += current_block_size
-                        block_num += 1
-
-                    # Copy blocks in parallel (without progress tracking)
-                    write_lock = threading.Lock()
-                    with ThreadPoolExecutor(max_workers=workers) as executor:
-                        futures = []
-                        for offset, size, _ in blocks:
-                            future = executor.submit(
-                                _benchmark_copy_block,
-                                str(test_file), str(dest_file), offset, size, write_lock
-                            )
-                            futures.append(future)
-
-                        for future in as_completed(futures):
-                            future.result()
-
-                    shutil.copystat(test_file, dest_file)
-
-                elapsed = time.time() - start
-                times.append(elapsed)
-
-            avg_time = sum(times) / len(times)
-            results[workers] = avg_time
+        # The file and block layouts are the same for every trial
+        file_size = test_file.stat().st_size
+        layouts = {block_size: _block_layout(file_size, block_size)
+                   for block_size in (BLOCK_SIZE,) + BENCHMARK_BLOCK_SIZES}
+        dest_file = tmpdir_path / "test_copy.bin"
+
+        def measure(workers, block_size):
+            # Bypass the progress bar for accurate timing
+            times = _time_trials(
+                lambda: _parallel_copy(executor, workers, test_file, dest_file, file_size, layouts[block_size]),
+                test_file, dest_file)
 
+            best_time = min(times)
+            results[(workers, block_size)] = best_time
+            medians[(workers, block_size)] = statistics.median(times)
+
+            if not quiet:
+                speed_mbps = (test_size / (1024 * 1024)) / best_time
+                print(f"  {workers:2d} workers, {format_size(block_size):>8} blocks: {best_time:.3f}s  ({speed_mbps:.1f} MB/s)  "
+                      f"{Colors.DIM}median {medians[(workers, block_size)]:.3f}s{Colors.RESET}")
+
+        # One pool for the whole run, so no trial pays thread start-up
+        with ThreadPoolExecutor(max_workers=max(worker_counts)) as executor:
+            if not quiet:
+                counts_str = ', '.join(str(workers) for workers in worker_counts)
+                print(f"\n{Colors.BOLD}Testing worker counts ({counts_str}):{Colors.RESET}")
+
+            # shutil.copy2 for reference only: a different algorithm, so it
+            # isn't a candidate
+            reference_time = min(_time_trials(lambda: shutil.copy2(test_file, dest_file), test_file, dest_file))
             if not quiet:
-                speed_mbps = (test_size / (1024 * 1024)) / avg_time
-                print(f"  {workers:2d} workers: {avg_time:.3f}s  ({speed_mbps:.1f} MB/s)")
+                speed_mbps = (test_size / (1024 * 1024)) / reference_time
+                print(f"  {Colors.DIM}shutil.copy2 (reference): {reference_time:.3f}s  ({speed_mbps:.1f} MB/s){Colors.RESET}")
 
-        # Find optimal worker count (worker count with minimum time)
-        optimal_workers = min(results.keys(), key=lambda k: results[k])
+            for workers in worker_counts:
+                measure(workers, BLOCK_SIZE)
+
+            # Block sizes are swept at the best multi-worker count, even when
+            # one worker wins, since that's what an explicit --parallel=N uses
+            parallel_workers, _ = min((k for k in results if k[0] > 1), key=lambda k: results[k])
+            if not quiet:
+                print(f"\n{Colors.BOLD}Testing block sizes ({parallel_workers} workers):{Colors.RESET}")
+            for block_size in BENCHMARK_BLOCK_SIZES:
+                measure(parallel_workers, block_size)
+
+            # Find optimal configuration (the one with minimum time)
+            optimal_workers, _ = min(results.keys(), key=lambda k: results[k])
+            _, optimal_block_size = min((k for k in results if k[0] == parallel_workers), key=lambda k: results[k])
+
+            # Calibrate the size from which parallel mode pays off: a serial
+            # copy of a prefix of the test file against the best parallel setup.
+            # Sizes under two blocks are split in halves, as _copy_entry splits
+            # them, so every size is timed with the layout it would really get
+            if not quiet:
+                print(f"\n{Colors.BOLD}Finding the smallest file worth a parallel copy "
+                      f"({parallel_workers} workers):{Colors.RESET}")
+            parallel_threshold = None
+            for size in BENCHMARK_THRESHOLD_SIZES:
+                layout = _block_layout(size, min(optimal_block_size, size // 2))
+                serial = min(_time_trials(lambda: _serial_copy(test_file, dest_file, size), test_file, dest_file))
+                parallel = min(_time_trials(
+                    lambda: _parallel_copy(executor, parallel_workers, test_file, dest_file, size, layout),
+                    test_file, dest_file))
+
+                if not quiet:
+                    print(f"  {format_size(size):>8}: serial {serial:.3f}s, parallel {parallel:.3f}s")
+                if parallel * PARALLEL_MIN_GAIN < serial:
+                    parallel_threshold = size
+                    break
 
         # Save to config
         config = load_config()
         config['optimal_parallel_workers'] = optimal_workers
+        config['optimal_block_size'] = optimal_block_size
+        if parallel_threshold is not None:
+            # Files larger than the threshold go parallel, and the calibrated
+            # size itself was measured to win
+            config['parallel_threshold_bytes'] = parallel_threshold - 1
+        else:
+            # Parallel never clearly won; keep the built-in threshold
+            config.pop('parallel_threshold_bytes', None)
         config['benchmark_date'] = time.strftime('%Y-%m-%d %H:%M:%S')
-        config['benchmark_results'] = {str(k): f"{v:.3f}s" for k, v in results.items()}
+        config['benchmark_results'] = {
+            f"{workers}x{format_size(block_size)}": f"{v:.3f}s (median {medians[(workers, block_size)]:.3f}s)"
+            for (workers, block_size), v in results.items()
+        }
+        config['benchmark_results']['shutil.copy2'] = f"{reference_time:.3f}s"
         save_config(config)
 
         if not quiet:
-            print(f"\n{Colors.GREEN}✓ Optimal configuration: {optimal_workers} workers{Colors.RESET}")
+            if parallel_threshold is not None:
+                threshold_str = f"parallel mode from {format_size(parallel_threshold)}"
+            else:
+                threshold_str = (f"parallel never beat serial by {PARALLEL_MIN_GAIN - 1:.0%} up to "
+                                 f"{format_size(BENCHMARK_THRESHOLD_SIZES[-1])}, "
+                                 f"keeping the built-in threshold ({format_size(PARALLEL_THRESHOLD)})")
+            print(f"\n{Colors.GREEN}✓ Optimal configuration: {optimal_workers} workers, "
+                  f"{format_size(optimal_block_size)} blocks, {threshold_str}{Colors.RESET}")
             print(f"{Colors.DIM}Configuration saved to: {CONFIG_FILE}{Colors.RESET}\n")
         else:
             print(f"{Colors.GREEN}✓ Optimal: {optimal_workers} workers (saved to config){Colors.RESET}")
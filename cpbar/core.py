@@ -9,12 +9,18 @@ import sys
 import argparse
 
 from . import __version__
-from .operations import do_copy, do_remove
-from .benchmark import run_benchmark
-from .utils import get_optimal_workers
+from .utils import get_optimal_workers, parse_size, format_size, BUFFER_SIZE
 from .ui import Colors
 
 
+def _size_arg(text: str) -> int:
+    """argparse type for sizes like 4M or 512K."""
+    try:
+        return parse_size(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
 def main():
     """Main entry point for cpbar CLI."""
     parser = argparse.ArgumentParser(
@@ -51,6 +57,7 @@ Examples:
   cp -n large_folder/ /backup/           # Dry-run: preview before copying
   cp --parallel=4 large.iso /backup/     # Fast parallel copy (4 workers)
   cp --parallel=8 *.mkv /backup/         # Parallel copy multiple large files (8 workers)
+  cp --buffer-size=4M big/ /mnt/zfs/     # Larger chunks for large-record filesystems
 
 Performance tips:
   • Use --parallel for files > 64MB on SSDs (2-4x faster)
@@ -68,16 +75,20 @@ Author:
     cp_parser.add_argument('-n', '--dry-run', action='store_true',
                           help='preview what would be copied without actually copying (shows file count, size, and estimated time)')
 
-    # Get optimal workers from config for help text
-    optimal = get_optimal_workers()
+    # Get optimal workers from config for -P and its help text; only cp uses
+    # them, so other commands skip reading the config
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    optimal = get_optimal_workers() if command == 'cp' else 4
     cp_parser.add_argument('-P', '--parallel', type=int, nargs='?', const=optimal, default=0, metavar='WORKERS',
-                          help=f'use parallel mode for large files (default: {optimal} workers from benchmark). Optimal: 4-8 for SSDs. Activates automatically for files > 64MB. Run "cpbar benchmark" to detect optimal value.')
+                          help=f'use parallel mode for large files (default: {optimal} workers from benchmark). Optimal: 4-8 for SSDs. Applies to files > 64MB, or the size found by "cpbar benchmark". Run "cpbar benchmark" to detect optimal value.')
+    cp_parser.add_argument('-B', '--buffer-size', type=_size_arg, default=BUFFER_SIZE, metavar='SIZE',
+                          help=f'bytes moved per copy call, e.g. 4M or 512K (default: {format_size(BUFFER_SIZE)})')
     cp_parser.add_argument('sources', nargs='+', help='source files or directories to copy')
     cp_parser.add_argument('destination', help='destination path')
 
     # Benchmark subcommand
     benchmark_parser = subparsers.add_parser('benchmark', help='Run benchmark to detect optimal parallel workers',
-                                            description='Tests different worker counts to determine the optimal configuration for your system.',
+                                            description='Tests different worker counts and block sizes to determine the optimal configuration for your system.',
                                             epilog="""
 Examples:
   cpbar benchmark              # Run full benchmark with detailed output
@@ -85,10 +96,13 @@ Examples:
 
 The benchmark will:
   • Create a temporary 100MB test file
-  • Test with 1, 2, 4, 6, and 8 workers
-  • Run 3 trials for each configuration
-  • Save the optimal setting to ~/.config/cpbar/config.json
-  • This setting becomes the default when using -P flag
+  • Test 1 to 2x your CPUs in workers (max 32), then block sizes from
+    256KB to 64MB at the best worker count
+  • Run 5 trials for each configuration and keep the fastest
+  • Find the smallest file size where a parallel copy beats a serial one
+  • Save the optimal settings to ~/.config/cpbar/config.json
+  • The worker count becomes the default when using -P flag, and the
+    block size is used for every parallel copy
 
 Author:
   Carlos Andrade <carlos@perezandrade.com>
@@ -138,12 +152,15 @@ Author:
         if len(args.sources) < 1:
             print(f"{Colors.RED}Error: At least one source file and a destination required{Colors.RESET}", file=sys.stderr)
             sys.exit(1)
-        do_copy(args.sources, args.destination, args.recursive, args.dry_run, args.parallel)
+        from .operations import do_copy
+        do_copy(args.sources, args.destination, args.recursive, args.dry_run, args.parallel, args.buffer_size)
 
     elif args.command == 'rm':
+        from .operations import do_remove
         do_remove(args.targets, args.recursive, args.force, args.dry_run)
 
     elif args.command == 'benchmark':
+        from .benchmark import run_benchmark
         run_benchmark(quiet=args.quiet)
 
 
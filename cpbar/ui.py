@@ -11,17 +11,19 @@ TTY Detection:
 Author: Carlos Andrade <carlos@perezandrade.com>
 """
 
+import os
 import sys
 import shutil
 import signal
 import time
 import threading
-from typing import Tuple
+from typing import Optional, Tuple
 
 from .utils import (
     format_size, format_time, format_speed,
     load_config, save_config,
-    SPEED_UPDATE_INTERVAL, SPEED_SMOOTHING_FACTOR
+    SPEED_UPDATE_INTERVAL, SPEED_SMOOTHING_FACTOR, SPEED_SAVE_TOLERANCE, RENDER_INTERVAL,
+    NON_TTY_LINE_INTERVAL
 )
 
 
@@ -29,6 +31,24 @@ from .utils import (
 IS_TTY = sys.stdout.isatty()
 
 
+def stdin_is_tty() -> bool:
+    """Whether someone can answer a prompt: stdin is a terminal, whatever stdout is."""
+    try:
+        return sys.stdin.isatty()
+    except (AttributeError, ValueError):  # No stdin at all, or closed
+        return False
+
+# Pre-built bar glyph runs; frames slice these instead of building new strings
+_BAR_FULL = "█" * 512
+_BAR_EMPTY = "░" * 512
+
+# Speed sampling period, and the pause after which the estimate restarts, in ns
+_SPEED_UPDATE_NS = int(SPEED_UPDATE_INTERVAL * 1_000_000_000)
+_SPEED_RESET_NS = 2_000_000_000
+# Minimum gap between non-TTY progress lines, in ns
+_NON_TTY_LINE_NS = int(NON_TTY_LINE_INTERVAL * 1_000_000_000)
+
+
 # ANSI escape codes for styling (empty if not TTY)
 class Colors:
     RESET = "\033[0m" if IS_TTY else ""
@@ -55,10 +75,11 @@ class Cursor:
         return ""
 
     @staticmethod
-    def move_to_bottom() -> str:
-        """Move cursor to last line of terminal."""
+    def move_to_bottom(rows: Optional[int] = None) -> str:
+        """Move cursor to last line of terminal (pass rows if already known)."""
         if IS_TTY:
-            rows = shutil.get_terminal_size().lines
+            if rows is None:
+                rows = shutil.get_terminal_size().lines
             return f"\033[{rows};1H"
         return ""
 
@@ -69,11 +90,13 @@ class ProgressBar:
     In non-TTY mode, falls back to simple line-based progress updates.
     """
 
+    # Bar the signal handlers act on, and whether they're installed yet
+    _active = None
+    _handlers_installed = False
+
     def __init__(self, total_items: int, total_bytes: int, operation: str):
         self.total_items = total_items
         self.total_bytes = total_bytes
-        self.completed_items = 0
-        self.completed_bytes = 0
         self.operation = operation
         self.current_file = ""
         self.interrupted = False
@@ -82,21 +105,77 @@ class ProgressBar:
         self.skipped_items = 0
         self.is_tty = IS_TTY
 
-        # Time estimation
-        self.start_time = time.time()
-        self.last_update_time = self.start_time
+        # Time estimation (monotonic integer nanoseconds: cheap and immune to clock jumps)
+        self._start_ns = time.monotonic_ns()
+        self._last_update_ns = self._start_ns
+        self._last_line_ns = 0  # last non-TTY progress line
 
         # Speed tracking
         self.last_bytes = 0
         self.current_speed = 0.0  # bytes per second
-
-        # Thread safety lock for concurrent updates
+        self._one_minus_alpha = 1.0 - SPEED_SMOOTHING_FACTOR
+
+        # Raw stdout descriptor for frame writes (None if stdout has no real fd)
+        try:
+            self._stdout_fd = sys.stdout.fileno()
+        except (AttributeError, OSError, ValueError):
+            self._stdout_fd = None
+        self._encoding = getattr(sys.stdout, 'encoding', None) or 'utf-8'
+
+        # Frame parts that don't change during the operation
+        self._op_icon = "📋" if operation == "cp" else "🗑️ "
+        self._total_items_str = f"/{total_items}"
+        self._total_bytes_str = f"/{format_size(total_bytes)}"
+
+        # Terminal size, cached until SIGWINCH marks it stale
+        self._term_size = None
+        # Last frame written, so unchanged frames aren't rewritten every tick
+        self._last_frame = None
+
+        # Completed bytes and items are sharded per thread: each thread only ever
+        # adds to its own [bytes, items] list, so the hot path takes no lock;
+        # readers sum the shards
+        self._shards = {}
+
+        # Thread safety lock for speed state, frame writes and non-TTY lines
         self._lock = threading.Lock()
-
-        # Handle Ctrl+C gracefully
-        signal.signal(signal.SIGINT, self._signal_handler)
+        # Copies may run on worker threads; only one prompt may own the terminal
+        self._prompt_lock = threading.Lock()
+
+        # Handle Ctrl+C gracefully (and resizes, in TTY mode) on the newest bar
+        ProgressBar._active = self
+        self._install_signal_handlers()
+
+        # In TTY mode a daemon thread repaints the bar every RENDER_INTERVAL,
+        # so update() never does terminal I/O on a copy thread
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._render_thread = None
         if self.is_tty:
-            signal.signal(signal.SIGWINCH, self._resize_handler)
+            self._render_thread = threading.Thread(target=self._render_loop, name="cpbar-render", daemon=True)
+            self._render_thread.start()
+
+    @classmethod
+    def _install_signal_handlers(cls):
+        """Install the process-wide signal handlers, once; they act on the active bar.
+
+        A signal that an embedding program already handles is left alone.
+        """
+        if cls._handlers_installed:
+            return
+        cls._handlers_installed = True
+        if signal.getsignal(signal.SIGINT) is signal.default_int_handler:
+            signal.signal(signal.SIGINT, cls._dispatch_sigint)
+        if IS_TTY and signal.getsignal(signal.SIGWINCH) == signal.SIG_DFL:
+            signal.signal(signal.SIGWINCH, cls._dispatch_sigwinch)
+
+    @classmethod
+    def _dispatch_sigint(cls, signum, frame):
+        cls._active._signal_handler(signum, frame)
+
+    @classmethod
+    def _dispatch_sigwinch(cls, signum, frame):
+        cls._active._resize_handler(signum, frame)
 
     def _signal_handler(self, signum, frame):
         self.interrupted = True
@@ -105,107 +184,186 @@ class ProgressBar:
         sys.exit(130)
 
     def _resize_handler(self, signum, frame):
-        """Handle terminal resize."""
-        self.update(self.current_file, 0)
+        """Handle terminal resize by marking the cached size and frame stale.
+
+        Only plain assignments here: the render thread re-reads the size and
+        repaints on its next tick. Waking it through the Event would take that
+        Event's internal lock, which the interrupted main thread may hold.
+        """
+        self._term_size = None
+        self._last_frame = None
+
+    def _render_loop(self):
+        """Repaint the progress bar until finish() (TTY mode only)."""
+        while not self._stop.is_set():
+            self._wake.wait(RENDER_INTERVAL)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            # An overwrite prompt owns the terminal; don't paint over it
+            if self._prompt_lock.acquire(blocking=False):
+                try:
+                    self._update_tty_display()
+                finally:
+                    self._prompt_lock.release()
+
+    def _stop_render(self, wait: bool = True):
+        """Stop the render thread, waiting for an in-progress frame if wait is set."""
+        self._stop.set()
+        self._wake.set()
+        if wait and self._render_thread is not None:
+            self._render_thread.join()
 
     def _get_terminal_size(self) -> Tuple[int, int]:
-        """Get terminal dimensions (columns, lines)."""
-        size = shutil.get_terminal_size()
-        return size.columns, size.lines
+        """Get terminal dimensions (columns, lines), cached between resizes."""
+        size = self._term_size
+        if size is None:
+            size = self._term_size = tuple(shutil.get_terminal_size())
+        return size
+
+    def _write(self, text: str):
+        """Write one fully built chunk of escape codes and text to the terminal.
+
+        Goes straight to the stdout file descriptor, skipping the text layer's
+        buffering and locking, when stdout has one.
+        """
+        if not text:
+            return
+        if self._stdout_fd is None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            return
+        data = text.encode(self._encoding, 'replace')
+        try:
+            while data:
+                data = data[os.write(self._stdout_fd, data):]
+        except BlockingIOError:
+            pass  # Non-blocking stdout that's full: drop the rest of this frame
 
     def _setup(self):
         """Setup the progress bar display area."""
         if self.started:
             return
         self.started = True
-        # Hide cursor and save position
-        sys.stdout.write(Cursor.HIDE)
-        # Add a blank line at the bottom for the progress bar
-        sys.stdout.write("\n")
+        # Frames bypass sys.stdout from here on; push out anything it still holds
         sys.stdout.flush()
+        # Hide cursor and add a blank line at the bottom for the progress bar
+        self._write(Cursor.HIDE + "\n")
 
     def _cleanup(self):
         """Restore terminal state."""
+        # May run in a signal handler that interrupted a lock holder, so don't join
+        self._stop_render(wait=False)
         # Show cursor
-        sys.stdout.write(Cursor.SHOW)
-        sys.stdout.flush()
+        self._write(Cursor.SHOW)
 
     def ask_overwrite(self, filepath: str) -> bool:
         """Ask user if they want to overwrite a file.
         Returns True if file should be overwritten, False to skip.
         Can also set self.overwrite_all if user chooses 'all'.
+        Without a terminal on stdin there is nobody to ask, so the file is
+        skipped rather than destroyed.
         """
         if self.overwrite_all:
             return True
+        if not stdin_is_tty():
+            self.skipped_items += 1
+            print(f"\n{Colors.YELLOW}Warning: Skipping existing '{filepath}' (no terminal to ask){Colors.RESET}",
+                  file=sys.stderr)
+            return False
+
+        with self._prompt_lock:
+            # Another thread may have answered "all" while we waited
+            if self.overwrite_all:
+                return True
+            if not self.is_tty:
+                # Output is redirected, but someone is at the keyboard
+                return self._prompt_overwrite_plain(filepath)
+            try:
+                return self._prompt_overwrite(filepath)
+            finally:
+                # The prompt scribbled over the bar area; repaint it in full
+                self._last_frame = None
+                self._resume_speed()
+
+    def _resume_speed(self):
+        """Restart speed sampling after a pause, keeping the estimate from before it.
+
+        Without this the first frame after a prompt sees a multi-second gap and
+        throws the smoothed speed away, so the ETA starts again from nothing.
+        """
+        with self._lock:
+            self.last_bytes = self.completed_bytes
+            self._last_update_ns = time.monotonic_ns()
 
+    def _prompt_overwrite(self, filepath: str) -> bool:
+        """Show the overwrite prompt and read the answer (caller holds _prompt_lock)."""
         _, rows = self._get_terminal_size()
 
         # Move to the line just above the progress bar and clear it
-        sys.stdout.write(Cursor.move_to(rows - 1, 1))
-        sys.stdout.write("\033[2K")  # Clear entire line
-        sys.stdout.flush()
+        clear_prompt_line = Cursor.move_to(rows - 1, 1) + "\033[2K"
+        prompt = f"{Colors.YELLOW}Overwrite '{filepath}'? [y/n/a/q]: {Colors.RESET}"
 
-        # Show cursor for input
-        sys.stdout.write(Cursor.SHOW)
+        # Show cursor for input, then prompt on the same line each time
+        self._write(Cursor.SHOW + clear_prompt_line + prompt)
 
         while True:
-            # Move to the same line each time
-            sys.stdout.write(Cursor.move_to(rows - 1, 1))
-            sys.stdout.write("\033[2K")  # Clear line
-            sys.stdout.flush()
-
-            # Use sys.stdout.write + input to control positioning
-            sys.stdout.write(f"{Colors.YELLOW}Overwrite '{filepath}'? [y/n/a/q]: {Colors.RESET}")
-            sys.stdout.flush()
             response = input().strip().lower()
 
             if response in ['y', 'yes']:
-                # Clear the prompt line
-                sys.stdout.write(Cursor.move_to(rows - 1, 1))
-                sys.stdout.write("\033[2K")
-                sys.stdout.flush()
-                # Hide cursor again
-                sys.stdout.write(Cursor.HIDE)
+                # Clear the prompt line and hide cursor again
+                self._write(clear_prompt_line + Cursor.HIDE)
                 return True
             elif response in ['n', 'no']:
                 self.skipped_items += 1
-                # Clear the prompt line
-                sys.stdout.write(Cursor.move_to(rows - 1, 1))
-                sys.stdout.write("\033[2K")
-                sys.stdout.flush()
-                # Hide cursor again
-                sys.stdout.write(Cursor.HIDE)
+                self._write(clear_prompt_line + Cursor.HIDE)
                 return False
             elif response in ['a', 'all']:
                 self.overwrite_all = True
-                # Clear the prompt line
-                sys.stdout.write(Cursor.move_to(rows - 1, 1))
-                sys.stdout.write("\033[2K")
-                sys.stdout.flush()
-                # Hide cursor again
-                sys.stdout.write(Cursor.HIDE)
+                self._write(clear_prompt_line + Cursor.HIDE)
                 return True
             elif response in ['q', 'quit']:
+                self.interrupted = True
                 self._cleanup()
                 print(f"\n{Colors.YELLOW}⚠ Operation cancelled by user{Colors.RESET}")
                 sys.exit(0)
             else:
-                # Show error on the same line
-                sys.stdout.write(Cursor.move_to(rows - 1, 1))
-                sys.stdout.write("\033[2K")
-                sys.stdout.write(f"{Colors.RED}Invalid option. Use: y (yes), n (no), a (all), q (quit){Colors.RESET}")
-                sys.stdout.flush()
-                time.sleep(1.5)  # Show error briefly before re-prompting
+                # Show error on the same line briefly, then re-prompt
+                self._write(clear_prompt_line + f"{Colors.RED}Invalid option. Use: y (yes), n (no), a (all), q (quit){Colors.RESET}")
+                time.sleep(1.5)
+                self._write(clear_prompt_line + prompt)
+
+    def _prompt_overwrite_plain(self, filepath: str) -> bool:
+        """Ask on stderr, one line per prompt, when stdout isn't a terminal (caller holds _prompt_lock)."""
+        while True:
+            sys.stderr.write(f"Overwrite '{filepath}'? [y/n/a/q]: ")
+            sys.stderr.flush()
+            response = input().strip().lower()
+
+            if response in ['y', 'yes']:
+                return True
+            elif response in ['n', 'no']:
+                self.skipped_items += 1
+                return False
+            elif response in ['a', 'all']:
+                self.overwrite_all = True
+                return True
+            elif response in ['q', 'quit']:
+                self.interrupted = True
+                print("Operation cancelled by user", file=sys.stderr)
+                sys.exit(0)
+            else:
+                print("Invalid option. Use: y (yes), n (no), a (all), q (quit)", file=sys.stderr)
 
     def _clear_line(self):
         """Clear the current line."""
         cols, _ = self._get_terminal_size()
-        sys.stdout.write("\r" + " " * cols + "\r")
-        sys.stdout.flush()
+        self._write("\r" + " " * cols + "\r")
 
     def _get_elapsed_time(self) -> str:
         """Get elapsed time since operation started."""
-        elapsed = time.time() - self.start_time
+        # Whole seconds render the same and keep format_time's cache hot
+        elapsed = (time.monotonic_ns() - self._start_ns) // 1_000_000_000
         return format_time(elapsed)
 
     def _calculate_bar_width(self, other_content_len: int) -> int:
@@ -218,70 +376,91 @@ class ProgressBar:
         # Minimum bar width of 10, no maximum - use all available space
         return int(max(10, available))
 
-    def update(self, current_file: str, bytes_delta: int = 0):
-        """Update progress bar with current state (thread-safe)."""
-        with self._lock:
-            self.current_file = current_file
-            self.completed_bytes += bytes_delta
+    def _shard(self) -> list:
+        """Return the calling thread's [bytes, items] counter shard."""
+        ident = threading.get_ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            shard = self._shards.setdefault(ident, [0, 0])
+        return shard
+
+    @property
+    def completed_bytes(self) -> int:
+        """Bytes completed so far, summed across the per-thread shards."""
+        return sum(shard[0] for shard in list(self._shards.values()))
+
+    @completed_bytes.setter
+    def completed_bytes(self, value: int):
+        """Set the byte count outright (kept for callers that assign it); not meant to race with updates."""
+        for shard in list(self._shards.values()):
+            shard[0] = 0
+        self._shard()[0] = value
+
+    @property
+    def completed_items(self) -> int:
+        """Items completed so far, summed across the per-thread shards."""
+        return sum(shard[1] for shard in list(self._shards.values()))
+
+    @completed_items.setter
+    def completed_items(self, value: int):
+        """Set the item count outright (kept for callers that assign it); not meant to race with updates."""
+        for shard in list(self._shards.values()):
+            shard[1] = 0
+        self._shard()[1] = value
 
-        if self.is_tty:
-            self._update_tty_display()
-        # Non-TTY mode: updates happen in complete_item()
+    def update(self, current_file: str, bytes_delta: int = 0):
+        """Update progress bar with current state (thread-safe, lock-free)."""
+        self.current_file = current_file
+        if bytes_delta:
+            self._shard()[0] += bytes_delta
+        # TTY mode: the render thread picks this up; non-TTY: complete_item() prints
 
     def _update_tty_display(self):
         """Update progress bar display in TTY mode (interactive terminal)."""
         self._setup()
 
         with self._lock:
+            # Snapshot the shards once, inside the lock, so speed samples stay ordered
+            completed_bytes = self.completed_bytes
+            completed_items = self.completed_items
+
             # Calculate speed (with smoothing)
-            current_time = time.time()
-            time_delta = current_time - self.last_update_time
+            now_ns = time.monotonic_ns()
+            delta_ns = now_ns - self._last_update_ns
 
             # Reset speed if there was a long pause (e.g., waiting for user input)
-            if time_delta > 2.0:
+            if delta_ns > _SPEED_RESET_NS:
                 self.current_speed = 0.0
-                self.last_bytes = self.completed_bytes
-                self.last_update_time = current_time
-            elif time_delta > SPEED_UPDATE_INTERVAL:  # Update speed every 100ms
-                bytes_since_last = self.completed_bytes - self.last_bytes
-                instant_speed = bytes_since_last / time_delta
+                self.last_bytes = completed_bytes
+                self._last_update_ns = now_ns
+            elif delta_ns > _SPEED_UPDATE_NS:  # Update speed every 100ms
+                bytes_since_last = completed_bytes - self.last_bytes
+                instant_speed = bytes_since_last * 1e9 / delta_ns
                 # Smooth the speed using exponential moving average
-                self.current_speed = SPEED_SMOOTHING_FACTOR * self.current_speed + (1 - SPEED_SMOOTHING_FACTOR) * instant_speed
-                self.last_bytes = self.completed_bytes
-                self.last_update_time = current_time
-            else:
-                self.last_update_time = current_time
+                self.current_speed = SPEED_SMOOTHING_FACTOR * self.current_speed + self._one_minus_alpha * instant_speed
+                self.last_bytes = completed_bytes
+                self._last_update_ns = now_ns
 
             # Capture values for rendering outside lock
-            progress_data = {
-                'completed_bytes': self.completed_bytes,
-                'completed_items': self.completed_items,
-                'total_bytes': self.total_bytes,
-                'total_items': self.total_items,
-                'current_speed': self.current_speed,
-                'current_file': self.current_file,
-            }
+            current_speed = self.current_speed
+            display_file = self.current_file
 
         cols, rows = self._get_terminal_size()
 
         # Calculate progress using captured data
-        completed_bytes = progress_data['completed_bytes']
-        completed_items = progress_data['completed_items']
-        total_bytes = progress_data['total_bytes']
-        total_items = progress_data['total_items']
-        current_speed = progress_data['current_speed']
-        display_file = progress_data['current_file']
+        total_bytes = self.total_bytes
+        total_items = self.total_items
 
         if total_bytes > 0:
             progress = min(completed_bytes / total_bytes, 1.0)
         else:
             progress = completed_items / total_items if total_items > 0 else 1.0
 
-        # Build components
-        op_icon = "📋" if self.operation == "cp" else "🗑️ "
+        # Build components (totals were formatted once in __init__)
+        op_icon = self._op_icon
         pct = f"{progress * 100:5.1f}%"
-        items_str = f"{completed_items}/{total_items}"
-        size_str = f"{format_size(completed_bytes)}/{format_size(total_bytes)}"
+        items_str = f"{completed_items}{self._total_items_str}"
+        size_str = format_size(completed_bytes) + self._total_bytes_str
 
         # Show elapsed time and speed
         elapsed_str = self._get_elapsed_time()
@@ -306,48 +485,66 @@ class ProgressBar:
 
         filled = int(bar_width * progress)
         empty = bar_width - filled
-        bar = f"{Colors.GREEN}{'█' * filled}{Colors.DIM}{'░' * empty}{Colors.RESET}"
+        if bar_width <= len(_BAR_FULL):
+            bar = f"{Colors.GREEN}{_BAR_FULL[:filled]}{Colors.DIM}{_BAR_EMPTY[:empty]}{Colors.RESET}"
+        else:
+            bar = f"{Colors.GREEN}{'█' * filled}{Colors.DIM}{'░' * empty}{Colors.RESET}"
 
         # Build the line
         line = f"{op_icon} {Colors.BOLD}{pct}{Colors.RESET} [{bar}] {items_str} | {size_str} | {Colors.DIM}{time_display}{Colors.RESET} | {Colors.CYAN}{display_name}{Colors.RESET}"
 
-        # Move to bottom, clear line, print
-        sys.stdout.write(Cursor.move_to_bottom())
-        sys.stdout.write("\033[2K")  # Clear entire line
-        sys.stdout.write(line)
-        sys.stdout.write(Cursor.move_to(rows - 1, 1))  # Move back up one line
-        sys.stdout.flush()
+        # Move to bottom, clear line, print, move back up one line: one write per
+        # frame (under the lock so concurrent frames don't interleave)
+        frame = Cursor.move_to_bottom(rows) + "\033[2K" + line + Cursor.move_to(rows - 1, 1)
+        with self._lock:
+            # Idle ticks (e.g. a stalled read) produce identical frames; skip the write
+            if frame != self._last_frame:
+                self._last_frame = frame
+                self._write(frame)
 
     def complete_item(self):
         """Mark one item as complete (thread-safe)."""
+        shard = self._shard()
+        if self.is_tty:
+            shard[1] += 1
+            return
+
+        # In non-TTY mode, print simple progress updates, at most one per
+        # NON_TTY_LINE_INTERVAL plus the last item so logs stay small; the
+        # lock keeps the printed counts in order across threads
         with self._lock:
-            self.completed_items += 1
-            
-            # In non-TTY mode, print simple progress updates
-            if not self.is_tty:
-                op_name = "Copied" if self.operation == "cp" else "Deleted"
-                progress_pct = (self.completed_items / self.total_items * 100) if self.total_items > 0 else 100
-                print(f"{op_name} [{self.completed_items}/{self.total_items}] ({progress_pct:.1f}%) {self.current_file}")
-                sys.stdout.flush()
+            shard[1] += 1
+            completed_items = self.completed_items
+            now = time.monotonic_ns()
+            if completed_items < self.total_items and now - self._last_line_ns < _NON_TTY_LINE_NS:
+                return
+            self._last_line_ns = now
+            op_name = "Copied" if self.operation == "cp" else "Deleted"
+            progress_pct = (completed_items / self.total_items * 100) if self.total_items > 0 else 100
+            print(f"{op_name} [{completed_items}/{self.total_items}] ({progress_pct:.1f}%) {self.current_file}")
+            sys.stdout.flush()
 
     def finish(self):
         """Finish progress bar and print summary."""
+        self._stop_render()
+
         # Save observed speed for adaptive learning
         if self.total_bytes > 0 and self.completed_bytes > 0:
-            elapsed = time.time() - self.start_time
+            elapsed = (time.monotonic_ns() - self._start_ns) * 1e-9
             # Only record if operation took more than 0.1 second for accuracy
             if elapsed > 0.1:
                 speed_mbps = (self.completed_bytes / (1024 * 1024)) / elapsed
 
-                # Save to config for future estimates
+                # Save to config for future estimates, unless this run is within
+                # SPEED_SAVE_TOLERANCE of what's already recorded
                 config = load_config()
                 key = 'copy_speeds_mbps' if self.operation == 'cp' else 'delete_speeds_mbps'
                 speeds = config.get(key, [])
-                speeds.append(speed_mbps)
-                # Keep only last 10 observations to prevent unbounded growth
-                speeds = speeds[-10:]
-                config[key] = speeds
-                save_config(config)
+                mean = sum(speeds) / len(speeds) if speeds else 0.0
+                if not speeds or abs(speed_mbps - mean) > mean * SPEED_SAVE_TOLERANCE:
+                    # Keep only last 10 observations to prevent unbounded growth
+                    config[key] = (speeds + [speed_mbps])[-10:]
+                    save_config(config)
 
         # Print summary
         op_name = "Copied" if self.operation == "cp" else "Deleted"
@@ -359,11 +556,9 @@ class ProgressBar:
 
         if self.is_tty:
             cols, rows = self._get_terminal_size()
-            # Clear the progress bar line
-            sys.stdout.write(Cursor.move_to_bottom())
-            sys.stdout.write("\033[2K")
-            sys.stdout.write(summary)
+            # Clear the progress bar line and replace it with the summary
             # Don't add extra newline - the shell prompt will handle spacing
+            self._write(Cursor.move_to_bottom(rows) + "\033[2K" + summary)
         else:
             # In non-TTY mode, just print the summary
             print(summary)
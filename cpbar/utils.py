@@ -5,9 +5,11 @@ Handles configuration management and formatting functions.
 Author: Carlos Andrade <carlos@perezandrade.com>
 """
 
+import os
 import json
+import tempfile
+from functools import lru_cache
 from pathlib import Path
-from typing import Tuple
 
 # Configuration file management
 CONFIG_FILE = Path.home() / ".config" / "cpbar" / "config.json"
@@ -16,26 +18,88 @@ CONFIG_FILE = Path.home() / ".config" / "cpbar" / "config.json"
 BUFFER_SIZE = 16 * 1024 * 1024  # 16MB
 BLOCK_SIZE = 32 * 1024 * 1024   # 32MB
 PARALLEL_THRESHOLD = 64 * 1024 * 1024  # 64MB
+BENCHMARK_BLOCK_SIZES = (256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024, 64 * 1024 * 1024)
+BENCHMARK_TRIALS = 5  # timed runs per benchmark configuration; the fastest counts
+BENCHMARK_MAX_WORKERS = 32  # upper bound on the worker counts the benchmark tries
+BENCHMARK_THRESHOLD_SIZES = (1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024, 64 * 1024 * 1024, 100 * 1024 * 1024)
+PARALLEL_MIN_GAIN = 1.1  # parallel mode must beat a serial copy by 10% for its threshold to be lowered
+SMALL_FILE_THRESHOLD = 1024 * 1024  # 1MB
+USERSPACE_CHUNK_MAX = 8 * 1024 * 1024  # 8MB cap on each preadv/pwrite when no kernel copy path works
+BATCH_QUEUE_DEPTH = 32  # per-file copies kept in flight on SSD/NVMe
+ROTATIONAL_QUEUE_DEPTH = 4  # per-file copies kept in flight when a spinning disk is involved
+REMOVE_BATCH_SIZE = 256  # files of one directory unlinked per rm task
+READAHEAD_WINDOW = 64 * 1024 * 1024  # 64MB prefetched ahead of large sequential copies
+DIRECT_IO_THRESHOLD = 256 * 1024 * 1024  # 256MB; larger cross-filesystem copies bypass the page cache
+DIRECT_IO_CHUNK = 2 * 1024 * 1024  # 2MB aligned O_DIRECT transfers
+SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # concurrent directory listings
 SPEED_UPDATE_INTERVAL = 0.1  # seconds
+RENDER_INTERVAL = SPEED_UPDATE_INTERVAL  # seconds between progress bar repaints
+NON_TTY_LINE_INTERVAL = 1.0  # seconds between progress lines when output isn't a terminal
+UPDATE_MIN_BYTES = 256 * 1024  # coalesce copy progress into updates of at least 256KB...
+UPDATE_MIN_INTERVAL = 0.02  # ...or one every 20ms, whichever comes first
 SPEED_SMOOTHING_FACTOR = 0.7
+SPEED_SAVE_TOLERANCE = 0.05  # don't rewrite the config for a speed within 5% of the recorded mean
 
 
-def load_config() -> dict:
-    """Load configuration from config file."""
-    if not CONFIG_FILE.exists():
-        return {}
+# Parsed config and the (mtime_ns, size) of the file it came from; reparsed
+# only when the file changes, e.g. another cpbar run saved a new speed
+_config_cache = None
+_config_stamp = None
+
+
+def _config_file_stamp():
+    """Return (mtime_ns, size) of the config file, or None if it doesn't exist."""
     try:
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return {}
+        st = CONFIG_FILE.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_config() -> dict:
+    """Load configuration from config file (served from memory while the file is unchanged)."""
+    global _config_cache, _config_stamp
+    stamp = _config_file_stamp()
+    if _config_cache is None or stamp != _config_stamp:
+        config = {}
+        if stamp is not None:
+            try:
+                with open(CONFIG_FILE, 'r') as f:
+                    config = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                pass
+        _config_cache = config
+        _config_stamp = stamp
+    # Callers modify what they get before saving; don't let that leak into the cache
+    return dict(_config_cache)
 
 
 def save_config(config: dict):
     """Save configuration to config file."""
+    global _config_cache, _config_stamp
     CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
-    with open(CONFIG_FILE, 'w') as f:
-        json.dump(config, f, indent=2)
+    # Write a temp file next to it and rename over, so readers never see a
+    # half-written config even if we're interrupted mid-write
+    fd, tmp_path = tempfile.mkstemp(dir=CONFIG_FILE.parent, prefix='.config.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(config, f, indent=2)
+        os.replace(tmp_path, CONFIG_FILE)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _config_cache = dict(config)
+    _config_stamp = _config_file_stamp()
+
+
+def invalidate_config():
+    """Forget the cached config so the next load_config() rereads the file."""
+    global _config_cache, _config_stamp
+    _config_cache = None
+    _config_stamp = None
 
 
 def get_optimal_workers() -> int:
@@ -44,43 +108,73 @@ def get_optimal_workers() -> int:
     return config.get('optimal_parallel_workers', 4)
 
 
+def get_optimal_block_size() -> int:
+    """Get the benchmarked block size for parallel copies from config, or return default."""
+    config = load_config()
+    return config.get('optimal_block_size', BLOCK_SIZE)
+
+
+def get_parallel_threshold() -> int:
+    """Get the benchmarked file size above which parallel mode is used, or return default."""
+    config = load_config()
+    return config.get('parallel_threshold_bytes', PARALLEL_THRESHOLD)
+
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+_SPEED_UNITS = ('B/s', 'KB/s', 'MB/s', 'GB/s', 'TB/s')
+
+
 def format_size(size: int) -> str:
     """Format bytes to human-readable size."""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if size < 1024:
-            return f"{size:.1f}{unit}"
-        size /= 1024
-    return f"{size:.1f}PB"
+    # Each unit is 10 more bits, so bit_length picks the unit without a loop
+    idx = min(max(int(size).bit_length() - 1, 0) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (idx * 10)):.1f}{_SIZE_UNITS[idx]}"
 
 
+@lru_cache(maxsize=256)
 def format_time(seconds: float) -> str:
-    """Format seconds to human-readable time."""
+    """Format seconds to human-readable time (cached; pass whole seconds to hit it)."""
     if seconds < 0:
         return "calculating..."
-    elif seconds < 60:
-        return f"{int(seconds)}s"
-    elif seconds < 3600:
-        mins = int(seconds / 60)
-        secs = int(seconds % 60)
+    secs = int(seconds)
+    if secs < 60:
+        return f"{secs}s"
+    mins, secs = divmod(secs, 60)
+    if mins < 60:
         return f"{mins}m {secs}s"
-    else:
-        hours = int(seconds / 3600)
-        mins = int((seconds % 3600) / 60)
-        return f"{hours}h {mins}m"
+    hours, mins = divmod(mins, 60)
+    return f"{hours}h {mins}m"
 
 
 def format_speed(bytes_per_second: float) -> str:
     """Format speed to human-readable format."""
-    if bytes_per_second < 1024:
+    idx = min(max(int(bytes_per_second).bit_length() - 1, 0) // 10, len(_SPEED_UNITS) - 1)
+    if idx == 0:
         return f"{bytes_per_second:.0f}B/s"
-    elif bytes_per_second < 1024 * 1024:
-        return f"{bytes_per_second / 1024:.1f}KB/s"
-    elif bytes_per_second < 1024 * 1024 * 1024:
-        return f"{bytes_per_second / (1024 * 1024):.1f}MB/s"
-    elif bytes_per_second < 1024 * 1024 * 1024 * 1024:
-        return f"{bytes_per_second / (1024 * 1024 * 1024):.1f}GB/s"
-    else:
-        return f"{bytes_per_second / (1024 * 1024 * 1024 * 1024):.1f}TB/s"
+    return f"{bytes_per_second / (1 << (idx * 10)):.1f}{_SPEED_UNITS[idx]}"
+
+
+_SIZE_MULTIPLIERS = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    """Parse a human-readable size such as '512K', '4M' or '4MB' into bytes."""
+    value = text.strip().upper()
+    for tail in ('IB', 'B'):
+        if value.endswith(tail) and len(value) > len(tail):
+            value = value[:-len(tail)]
+            break
+    multiplier = 1
+    if value and value[-1] in _SIZE_MULTIPLIERS:
+        multiplier = _SIZE_MULTIPLIERS[value[-1]]
+        value = value[:-1]
+    try:
+        size = int(float(value) * multiplier)
+    except (ValueError, OverflowError):  # e.g. "inf" or "1e400"
+        raise ValueError(f"invalid size: '{text}'") from None
+    if size <= 0:
+        raise ValueError(f"size must be positive: '{text}'")
+    return size
 
 
 def estimate_operation_time(total_bytes: int, operation: str = 'cp') -> str:
@@ -110,8 +204,24 @@ def estimate_operation_time(total_bytes: int, operation: str = 'cp') -> str:
     return format_time(estimated_seconds)
 
 
+_SYSTEM_PATHS = ('/bin', '/boot', '/etc', '/lib', '/lib64', '/sbin', '/sys', '/usr', '/proc', '/dev')
+
+
+@lru_cache(maxsize=1)
+def _system_roots() -> frozenset:
+    """Resolved system directories that exist on this machine, computed once."""
+    roots = set()
+    for system_dir in _SYSTEM_PATHS:
+        try:
+            if os.path.exists(system_dir):
+                roots.add(Path(system_dir).resolve())
+        except (OSError, RuntimeError):
+            pass
+    return frozenset(roots)
+
+
 def is_system_directory(path: Path) -> bool:
-    """Check if path is a system directory that requires native cp/rm.
+    """Check if path is inside a system directory (/usr, /etc, ...).
 
     Args:
         path: Path to check
@@ -119,34 +229,19 @@ def is_system_directory(path: Path) -> bool:
     Returns:
         True if path is inside a system directory
     """
-    system_paths = ['/bin', '/boot', '/etc', '/lib', '/lib64', '/sbin', '/sys', '/usr', '/proc', '/dev']
-
     try:
-        resolved = path.resolve()
-        for system_dir in system_paths:
-            system_path = Path(system_dir)
-            if not system_path.exists():
-                continue
-            system_resolved = system_path.resolve()
-
-            if resolved == system_resolved:
-                return True
-
-            if hasattr(resolved, 'is_relative_to'):
-                if resolved.is_relative_to(system_resolved):
-                    return True
-            else:
-                try:
-                    resolved.relative_to(system_resolved)
-                    return True
-                except ValueError:
-                    pass
+        resolved = Path(path).resolve()
     except (OSError, RuntimeError):
-        pass
+        return False
 
-    return False
+    roots = _system_roots()
+    return resolved in roots or not roots.isdisjoint(resolved.parents)
 
 
 def validate_destination(path: Path) -> None:
-    """Legacy validation function - now handled via fallback to native cp."""
+    """Legacy validation hook, kept for compatibility.
+
+    System-directory destinations are copied normally; do_copy only checks
+    up front that they are writable (see is_system_directory).
+    """
     pass
@@ -10,7 +10,7 @@ import shutil
 from pathlib import Path
 import pytest
 
-from cpbar.operations import get_all_files, copy_file_with_progress
+from cpbar.operations import get_all_files, copy_file_with_progress, copy_file_parallel, do_copy
 from cpbar.ui import ProgressBar
 
 
@@ -110,6 +110,267 @@ class TestCopyOperations:
         assert src_mode == dst_mode
         progress.finish()
 
+    def test_copy_preserves_timestamps(self):
+        """Test that access and modification times are preserved, including read-only files."""
+        test_file = self.src_dir / "dated.txt"
+        test_file.write_text("old data")
+        os.utime(test_file, ns=(1_000_000_000_123_456_789, 1_100_000_000_987_654_321))
+        test_file.chmod(0o444)
+
+        dst_file = self.dst_dir / "dated.txt"
+        progress = ProgressBar(total_items=1, total_bytes=test_file.stat().st_size, operation="cp")
+
+        # Taken before the copy, since reading the source may bump its atime
+        src_stat = test_file.stat()
+        copy_file_with_progress(str(test_file), str(dst_file), progress)
+
+        dst_stat = dst_file.stat()
+        assert dst_stat.st_mtime_ns == src_stat.st_mtime_ns
+        assert dst_stat.st_atime_ns == src_stat.st_atime_ns
+        assert oct(dst_stat.st_mode & 0o777) == oct(0o444)
+        progress.finish()
+
+    def test_copy_userspace_fallback(self, monkeypatch):
+        """Test copying when no kernel copy fast path is available."""
+        import cpbar.operations as operations
+        monkeypatch.setattr(operations, "_HAS_COPY_FILE_RANGE", False)
+        monkeypatch.setattr(operations, "_HAS_SENDFILE", False)
+        monkeypatch.setattr(operations, "_HAS_SPLICE", False)
+
+        test_file = self.src_dir / "fallback.bin"
+        data = os.urandom(300 * 1024)
+        test_file.write_bytes(data)
+
+        dst_file = self.dst_dir / "fallback.bin"
+        progress = ProgressBar(total_items=1, total_bytes=len(data), operation="cp")
+
+        result = copy_file_with_progress(str(test_file), str(dst_file), progress, buffer_size=64 * 1024)
+
+        assert result is True
+        assert dst_file.read_bytes() == data
+        assert progress.completed_bytes == len(data)
+        progress.finish()
+
+    @pytest.mark.skipif(not hasattr(os, "splice"), reason="splice(2) not available")
+    def test_copy_splice_path(self, monkeypatch):
+        """Test the splice fallback used when copy_file_range and sendfile can't be."""
+        import cpbar.operations as operations
+        monkeypatch.setattr(operations, "_HAS_COPY_FILE_RANGE", False)
+        monkeypatch.setattr(operations, "_HAS_SENDFILE", False)
+
+        test_file = self.src_dir / "splice.bin"
+        data = os.urandom(3 * 1024 * 1024 + 7)
+        test_file.write_bytes(data)
+
+        dst_file = self.dst_dir / "splice.bin"
+        progress = ProgressBar(total_items=1, total_bytes=len(data), operation="cp")
+
+        result = copy_file_with_progress(str(test_file), str(dst_file), progress)
+
+        assert result is True
+        assert dst_file.read_bytes() == data
+        assert progress.completed_bytes == len(data)
+        progress.finish()
+
+    def test_copy_direct_then_tail(self):
+        """Test that an O_DIRECT bulk copy plus a buffered tail reproduces the file."""
+        import cpbar.operations as operations
+        from cpbar.utils import DIRECT_IO_CHUNK
+
+        test_file = self.src_dir / "direct.bin"
+        data = os.urandom(2 * DIRECT_IO_CHUNK + 4321)
+        test_file.write_bytes(data)
+
+        dst_file = self.dst_dir / "direct.bin"
+        dst_file.write_bytes(b"")
+
+        # Filesystems without O_DIRECT (e.g. tmpfs) copy nothing here
+        copied = operations._copy_direct(str(test_file), str(dst_file), len(data))
+        assert copied % DIRECT_IO_CHUNK == 0
+
+        with open(test_file, "rb") as fsrc, open(dst_file, "r+b") as fdst:
+            operations._copy_fd(fsrc.fileno(), fdst.fileno(), copied, len(data) - copied)
+
+        assert dst_file.read_bytes() == data
+
+    def test_copy_file_parallel(self):
+        """Test block-parallel copy of a file spanning several blocks."""
+        test_file = self.src_dir / "blocks.bin"
+        data = os.urandom(1024 * 1024 + 12345)
+        test_file.write_bytes(data)
+
+        dst_file = self.dst_dir / "blocks.bin"
+        progress = ProgressBar(total_items=1, total_bytes=len(data), operation="cp")
+
+        result = copy_file_parallel(str(test_file), str(dst_file), progress, num_workers=4, block_size=128 * 1024)
+
+        assert result is True
+        assert dst_file.read_bytes() == data
+        assert progress.completed_bytes == len(data)
+        progress.finish()
+
+    def test_progress_counters_can_be_assigned(self):
+        """Test that assigning the completed counters replaces what every thread has added."""
+        import threading
+        progress = ProgressBar(total_items=10, total_bytes=1000, operation="cp")
+        progress.update("a", 300)
+        progress.complete_item()
+        worker = threading.Thread(target=lambda: (progress.update("b", 200), progress.complete_item()))
+        worker.start()
+        worker.join()
+        assert progress.completed_bytes == 500
+        assert progress.completed_items == 2
+
+        progress.completed_bytes = 50
+        progress.completed_items = 1
+        assert progress.completed_bytes == 50
+        assert progress.completed_items == 1
+
+        progress.update("c", 25)
+        assert progress.completed_bytes == 75
+        progress.finish()
+
+    def test_copy_file_parallel_small_keeps_buffer_size(self, monkeypatch):
+        """Test that a file too small to split is copied serially with the requested buffer size."""
+        import cpbar.operations as operations
+        calls = []
+        serial_copy = operations.copy_file_with_progress
+        monkeypatch.setattr(operations, "copy_file_with_progress",
+                            lambda src, dst, progress, buffer_size, **kwargs:
+                            calls.append(buffer_size) or serial_copy(src, dst, progress, buffer_size, **kwargs))
+
+        test_file = self.src_dir / "small.bin"
+        test_file.write_bytes(os.urandom(1000))
+        dst_file = self.dst_dir / "small.bin"
+        progress = ProgressBar(total_items=1, total_bytes=1000, operation="cp")
+
+        copy_file_parallel(str(test_file), str(dst_file), progress, block_size=128 * 1024, buffer_size=64 * 1024)
+
+        assert calls == [64 * 1024]
+        assert dst_file.read_bytes() == test_file.read_bytes()
+        progress.finish()
+
+    def test_do_copy_many_files(self):
+        """Test copying a directory with enough files to use concurrent copies."""
+        tree = self.src_dir / "tree"
+        for i in range(100):
+            sub = tree / f"d{i % 5}"
+            sub.mkdir(parents=True, exist_ok=True)
+            (sub / f"f{i}.txt").write_text(str(i))
+
+        do_copy([str(tree)], str(self.dst_dir), recursive=True)
+
+        copied = sorted(p.relative_to(self.dst_dir / "tree") for p in (self.dst_dir / "tree").rglob("*.txt"))
+        expected = sorted(p.relative_to(tree) for p in tree.rglob("*.txt"))
+        assert copied == expected
+        assert (self.dst_dir / "tree" / "d3" / "f8.txt").read_text() == "8"
+
+    def test_do_copy_stops_at_first_worker_error(self, monkeypatch):
+        """Test that an unexpected error in one copy cancels the copies still queued."""
+        import threading
+        import time
+        import cpbar.operations as operations
+        tree = self.src_dir / "tree"
+        tree.mkdir()
+        for i in range(200):
+            (tree / f"f{i}.txt").write_text("x")
+
+        calls = []
+        lock = threading.Lock()
+
+        def failing_entry(*args):
+            with lock:
+                calls.append(args[0])
+                first = len(calls) == 1
+            if first:
+                raise RuntimeError("fatal")
+            time.sleep(0.01)
+
+        monkeypatch.setattr(operations, "_copy_entry", failing_entry)
+        with pytest.raises(RuntimeError):
+            do_copy([str(tree)], str(self.dst_dir), recursive=True)
+
+        assert len(calls) < 200
+
+    def test_do_copy_asks_once_for_conflicts(self, monkeypatch):
+        """Test that existing destinations are settled by a single prompt before copying."""
+        tree = self.src_dir / "tree"
+        tree.mkdir()
+        for i in range(5):
+            (tree / f"f{i}.txt").write_text("new")
+        (self.dst_dir / "tree").mkdir()
+        for i in range(2):
+            (self.dst_dir / "tree" / f"f{i}.txt").write_text("old")
+
+        answers = []
+        monkeypatch.setattr("cpbar.operations.stdin_is_tty", lambda: True)
+        monkeypatch.setattr("builtins.input", lambda prompt="": answers.append(prompt) or "n")
+        do_copy([str(tree)], str(self.dst_dir), recursive=True)
+
+        assert len(answers) == 1
+        assert (self.dst_dir / "tree" / "f0.txt").read_text() == "old"
+        assert (self.dst_dir / "tree" / "f1.txt").read_text() == "old"
+        assert (self.dst_dir / "tree" / "f4.txt").read_text() == "new"
+
+    def test_do_copy_lists_every_conflict(self, monkeypatch, capsys):
+        """Test that listing conflicts at the prompt shows all of them."""
+        tree = self.src_dir / "tree"
+        tree.mkdir()
+        (self.dst_dir / "tree").mkdir()
+        for i in range(15):
+            (tree / f"f{i}.txt").write_text("new")
+            (self.dst_dir / "tree" / f"f{i}.txt").write_text("old")
+
+        answers = iter(["l", "n"])
+        monkeypatch.setattr("cpbar.operations.stdin_is_tty", lambda: True)
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+        do_copy([str(tree)], str(self.dst_dir), recursive=True)
+
+        err = capsys.readouterr().err
+        for i in range(15):
+            assert f"f{i}.txt" in err
+
+    def test_do_copy_without_terminal_skips_conflicts(self, monkeypatch):
+        """Test that with nobody at stdin, existing files are kept rather than overwritten."""
+        tree = self.src_dir / "tree"
+        tree.mkdir()
+        for i in range(3):
+            (tree / f"f{i}.txt").write_text("new")
+        (self.dst_dir / "tree").mkdir()
+        (self.dst_dir / "tree" / "f0.txt").write_text("old")
+
+        monkeypatch.setattr("cpbar.operations.stdin_is_tty", lambda: False)
+        monkeypatch.setattr("builtins.input", lambda prompt="": pytest.fail("prompted without a terminal"))
+        do_copy([str(tree)], str(self.dst_dir), recursive=True)
+
+        assert (self.dst_dir / "tree" / "f0.txt").read_text() == "old"
+        assert (self.dst_dir / "tree" / "f2.txt").read_text() == "new"
+
+    def test_do_copy_same_destination_twice(self, monkeypatch):
+        """Test that two sources copied to one new path count as a conflict."""
+        for name in ("a", "b"):
+            (self.src_dir / name).mkdir()
+            (self.src_dir / name / "x.txt").write_text(name * 1000)
+        sources = [str(self.src_dir / "a" / "x.txt"), str(self.src_dir / "b" / "x.txt")]
+
+        answers = []
+        monkeypatch.setattr("cpbar.operations.stdin_is_tty", lambda: True)
+        monkeypatch.setattr("builtins.input", lambda prompt="": answers.append(prompt) or "n")
+        do_copy(sources, str(self.dst_dir), recursive=False)
+
+        # Declining keeps only the first copy; accepting writes the repeat over it
+        assert len(answers) == 1
+        first = (self.dst_dir / "x.txt").read_text()
+        assert first in ("a" * 1000, "b" * 1000)
+
+        monkeypatch.setattr("builtins.input", lambda prompt="": "y")
+        (self.dst_dir / "x.txt").unlink()
+        do_copy(sources, str(self.dst_dir), recursive=False)
+
+        last = (self.dst_dir / "x.txt").read_text()
+        assert last in ("a" * 1000, "b" * 1000)
+        assert last != first
+
     def test_get_all_files_single(self):
         """Test getting files from a single file path."""
         test_file = self.src_dir / "file.txt"
@@ -154,6 +415,19 @@ class TestCopyOperations:
         total_size = sum(f[1] for f in files)
         assert total_size == 6  # 1 + 2 + 3
 
+    def test_get_all_files_disk_order(self):
+        """Test that disk_order sorts files by device and inode."""
+        for name in ("c.txt", "a.txt", "b.txt"):
+            (self.src_dir / name).write_text(name)
+        (self.src_dir / "sub").mkdir()
+        (self.src_dir / "sub" / "d.txt").write_text("d")
+
+        files = get_all_files([str(self.src_dir)], recursive=True, disk_order=True)
+
+        keys = [(os.stat(f[0]).st_dev, os.stat(f[0]).st_ino) for f in files]
+        assert len(files) == 4
+        assert keys == sorted(keys)
+
     def test_get_all_files_multiple_paths(self):
         """Test getting files from multiple paths."""
         file1 = self.src_dir / "file1.txt"
@@ -10,7 +10,7 @@ import shutil
 from pathlib import Path
 import pytest
 
-from cpbar.operations import get_all_files
+from cpbar.operations import get_all_files, do_remove
 
 
 class TestRemoveOperations:
@@ -66,3 +66,28 @@ class TestRemoveOperations:
         
         assert len(files) == 0
         assert "is a directory" in error_output
+
+    def test_get_files_for_removal_collects_directories(self):
+        """Test that the walk also reports every directory, parents before children."""
+        (self.work_dir / "a" / "b").mkdir(parents=True)
+        (self.work_dir / "a" / "b" / "file.txt").write_text("x")
+        (self.work_dir / "empty").mkdir()
+
+        dirs = []
+        get_all_files([str(self.work_dir)], recursive=True, dirs=dirs)
+
+        assert sorted(dirs) == sorted([str(self.work_dir), str(self.work_dir / "a"),
+                                       str(self.work_dir / "a" / "b"), str(self.work_dir / "empty")])
+        assert dirs.index(str(self.work_dir / "a")) < dirs.index(str(self.work_dir / "a" / "b"))
+
+    def test_remove_tree_with_empty_subdirectories(self):
+        """Test that a recursive remove takes the files and all nested (even empty) directories."""
+        target = self.work_dir / "tree"
+        (target / "a" / "b").mkdir(parents=True)
+        (target / "c").mkdir()
+        (target / "a" / "b" / "file.txt").write_text("x")
+        (target / "top.txt").write_text("y")
+
+        do_remove([str(target)], recursive=True, force=True)
+
+        assert not target.exists()
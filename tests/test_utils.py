@@ -0,0 +1,115 @@
+"""
+Tests for utility functions in cpbar.
+
+Author: Carlos Andrade <carlos@perezandrade.com>
+"""
+
+import argparse
+import json
+import os
+import time
+import pytest
+
+import cpbar.utils as utils
+from cpbar.utils import parse_size, load_config, save_config, invalidate_config
+from cpbar.core import _size_arg
+from cpbar.ui import ProgressBar
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """Point the config at a temporary file, with an empty cache on both sides of the test."""
+    path = tmp_path / "cpbar" / "config.json"
+    monkeypatch.setattr(utils, "CONFIG_FILE", path)
+    invalidate_config()
+    yield path
+    invalidate_config()
+
+
+class TestParseSize:
+    """Test suite for size parsing."""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("4M", 4 * 1024 * 1024),
+        ("512K", 512 * 1024),
+        ("4MiB", 4 * 1024 * 1024),
+        ("4MB", 4 * 1024 * 1024),
+        ("1g", 1024 * 1024 * 1024),
+        ("4096", 4096),
+    ])
+    def test_parse_size_valid(self, text, expected):
+        """Test that sizes with and without a suffix parse to bytes."""
+        assert parse_size(text) == expected
+
+    @pytest.mark.parametrize("text", ["0", "-1", "inf", "abc", ""])
+    def test_parse_size_invalid(self, text):
+        """Test that zero, negative, infinite and malformed sizes are rejected."""
+        with pytest.raises(ValueError):
+            parse_size(text)
+
+    def test_size_arg(self):
+        """Test that the argparse type accepts sizes and reports bad ones as usage errors."""
+        assert _size_arg("4M") == 4 * 1024 * 1024
+        for text in ("0", "-1", "inf", "abc"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                _size_arg(text)
+
+
+class TestConfig:
+    """Test suite for the cached config file."""
+
+    def test_save_then_load_round_trips(self, config_file):
+        """Test that a saved config is what the next load returns."""
+        save_config({"optimal_parallel_workers": 8, "copy_speeds_mbps": [120.5]})
+
+        assert load_config() == {"optimal_parallel_workers": 8, "copy_speeds_mbps": [120.5]}
+        invalidate_config()
+        assert load_config() == {"optimal_parallel_workers": 8, "copy_speeds_mbps": [120.5]}
+
+    def test_external_rewrite_is_reread(self, config_file):
+        """Test that a config rewritten by another process replaces the cached one."""
+        save_config({"optimal_parallel_workers": 4})
+        assert load_config()["optimal_parallel_workers"] == 4
+
+        config_file.write_text(json.dumps({"optimal_parallel_workers": 16, "optimal_block_size": 1048576}))
+        # Same size and a coarse mtime could both match; make the change visible either way
+        st = config_file.stat()
+        os.utime(config_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        assert load_config() == {"optimal_parallel_workers": 16, "optimal_block_size": 1048576}
+
+    def test_mutating_result_does_not_touch_cache(self, config_file):
+        """Test that changing the returned dict leaves later loads unchanged."""
+        save_config({"optimal_parallel_workers": 4})
+
+        config = load_config()
+        config["optimal_parallel_workers"] = 99
+        config["extra"] = True
+
+        assert load_config() == {"optimal_parallel_workers": 4}
+
+    def test_failed_save_keeps_old_config(self, config_file):
+        """Test that a save that fails mid-write leaves the previous file and no temp file."""
+        save_config({"optimal_parallel_workers": 4})
+
+        with pytest.raises(TypeError):
+            save_config({"optimal_parallel_workers": 8, "unserializable": object()})
+
+        assert json.loads(config_file.read_text()) == {"optimal_parallel_workers": 4}
+        assert list(config_file.parent.glob(".config.*.tmp")) == []
+
+    @pytest.mark.parametrize("recorded, appended", [(100.0, False), (50.0, True)])
+    def test_finish_skips_speed_within_tolerance(self, config_file, recorded, appended):
+        """Test that a run close to the recorded mean speed doesn't rewrite the config."""
+        save_config({"copy_speeds_mbps": [recorded]})
+
+        # 100MB in about one second: ~100 MB/s
+        progress = ProgressBar(total_items=1, total_bytes=100 * 1024 * 1024, operation="cp")
+        progress._start_ns = time.monotonic_ns() - 1_000_000_000
+        progress.update("file.bin", 100 * 1024 * 1024)
+        progress.complete_item()
+        progress.finish()
+
+        speeds = load_config()["copy_speeds_mbps"]
+        assert len(speeds) == (2 if appended else 1)
+        assert speeds[0] == recorded